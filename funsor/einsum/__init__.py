@@ -46,11 +46,11 @@ def naive_contract_einsum(eqn, *terms, **kwargs):
     inputs = inputs.split(",")
     assert len(inputs) == len(terms)
     assert len(output.split(",")) == 1
-    input_dims = frozenset(d for inp in inputs for d in inp)
-    output_dims = frozenset(d for d in output)
+    input_dims = frozenset("".join(inputs))
+    output_dims = frozenset(output)
     all_inputs = {k: v for term in terms for k, v in term.inputs.items()}
     reduced_vars = frozenset(
-        Variable(k, all_inputs[k]) for k in input_dims - output_dims
+        Variable(k, all_inputs[k]) for k in input_dims.difference(output_dims)
     )
     return Contraction(sum_op, prod_op, reduced_vars, *terms)
 
@@ -69,9 +69,9 @@ def naive_einsum(eqn, *terms, **kwargs):
     assert all(isinstance(term, Funsor) for term in terms)
     inputs, output = eqn.split("->")
     assert len(output.split(",")) == 1
-    input_dims = frozenset(d for inp in inputs.split(",") for d in inp)
+    input_dims = frozenset("".join(inputs.split(",")))
     output_dims = frozenset(output)
-    reduce_dims = input_dims - output_dims
+    reduce_dims = input_dims.difference(output_dims)
     return reduce(prod_op, terms).reduce(sum_op, reduce_dims)
 
 
@@ -86,6 +86,7 @@ def naive_plated_einsum(eqn, *terms, **kwargs):
     plates = kwargs.pop("plates", "")
     if not plates:
         return naive_einsum(eqn, *terms, **kwargs)
+    plate_set = frozenset(plates)
 
     backend = kwargs.pop("backend", "torch")
     if backend in BACKEND_OPS:
@@ -99,17 +100,17 @@ def naive_plated_einsum(eqn, *terms, **kwargs):
     inputs = inputs.split(",")
     assert len(inputs) == len(terms)
     assert len(output.split(",")) == 1
-    input_dims = frozenset(d for inp in inputs for d in inp)
-    output_dims = frozenset(d for d in output)
-    plate_dims = frozenset(plates) - output_dims
-    reduce_vars = input_dims - output_dims - frozenset(plates)
+    input_dims = frozenset("".join(inputs))
+    output_dims = frozenset(output)
+    plate_dims = plate_set - output_dims
+    reduce_vars = input_dims - output_dims - plate_set
 
-    output_plates = output_dims & frozenset(plates)
+    output_plates = output_dims & plate_set
     if not all(output_plates.issubset(inp) for inp in inputs):
         raise NotImplementedError("TODO")
 
     eliminate = plate_dims | reduce_vars
-    return sum_product(sum_op, prod_op, terms, eliminate, frozenset(plates))
+    return sum_product(sum_op, prod_op, terms, eliminate, plate_set)
 
 
 def einsum(eqn, *terms, **kwargs):
@@ -9,7 +9,7 @@ from functools import singledispatch
 
 import makefun
 
-from funsor.instrument import debug_logged
+from funsor.instrument import DEBUG, PROFILE, debug_logged
 from funsor.terms import Funsor, FunsorMeta, Variable, eager, to_funsor
 from funsor.util import as_callable
 
@@ -19,6 +19,11 @@ def _get_name(fn):
 
 
 def _erase_types(fn):
+    if not (DEBUG or PROFILE):
+        # Eager patterns are registered with explicit types, so annotations on
+        # fn are never inspected and fn can be registered without a wrapper.
+        return fn
+
     def result(*args):
         return fn(*args)
 
@@ -4,7 +4,7 @@
 import math
 from collections import OrderedDict, defaultdict
 from contextlib import contextmanager
-from functools import reduce
+from functools import lru_cache
 
 import funsor.ops as ops
 from funsor.affine import affine_inputs, extract_affine, is_affine
@@ -26,6 +26,8 @@ from funsor.terms import (
 )
 from funsor.util import broadcast_shape, get_tracing_state, lazy_property
 
+_LOG_2PI = math.log(2 * math.pi)
+
 
 def _log_det_tri(x):
     return ops.log(ops.diagonal(x, -1, -2)).sum(-1)
@@ -56,12 +58,6 @@ def _mmt(mat1, mat2=None):
     return mat1 @ ops.transpose(mat2, -1, -2)
 
 
-def _mtm(mat1, mat2=None):
-    if mat2 is None:
-        mat2 = mat1
-    return ops.transpose(mat1, -1, -2) @ mat2
-
-
 def _inverse_cholesky(P):
     """
     Computes a Cholesky decomposition of the inverse of a posdef matrix.
@@ -142,9 +138,15 @@ def _compute_offsets(inputs):
     :rtype: tuple
     """
     assert isinstance(inputs, OrderedDict)
+    return _compute_offsets_cached(tuple(inputs.items()))
+
+
+@lru_cache(maxsize=5000)
+def _compute_offsets_cached(inputs):
+    # Note the resulting offsets are shared and must not be mutated.
     offsets = OrderedDict()
     total = 0
-    for key, domain in inputs.items():
+    for key, domain in inputs:
         if domain.dtype == "real":
             offsets[key] = total
             total += domain.num_elements
@@ -157,33 +159,43 @@ def _split_real_inputs(inputs, lhs_keys, prototype):
     dimension such that ``lhs`` indexes into real inputs in ``lhs_keys`` and
     ``rhs`` indexes into everything else.
     """
-    lhs_blocks = []
-    rhs_blocks = []
-    start = 0
-    for key, domain in inputs.items():
-        if domain.dtype == "real":
-            stop = start + domain.num_elements
-            (lhs_blocks if key in lhs_keys else rhs_blocks).append(slice(start, stop))
-            start = stop
+    lhs_blocks, rhs_blocks = _split_plan(tuple(inputs.items()), frozenset(lhs_keys))
 
     # There are three cases: lhs left of rhs (cheap slices), lhs right of rhs
     # (cheap slices), and interleaved (expensive advanced indexing tensors).
-    lhs_start = min(b.start for b in lhs_blocks)
-    rhs_start = min(b.start for b in rhs_blocks)
-    lhs_stop = max(b.stop for b in lhs_blocks)
-    rhs_stop = max(b.stop for b in rhs_blocks)
-    if lhs_stop <= rhs_start or rhs_stop <= lhs_start:
+    if len(lhs_blocks) == 1 and len(rhs_blocks) == 1:
         # Construct cheap slices.
-        lhs = slice(lhs_start, lhs_stop)
-        rhs = slice(rhs_start, rhs_stop)
+        lhs = slice(*lhs_blocks[0])
+        rhs = slice(*rhs_blocks[0])
         return lhs, rhs
 
     # Construct interleaving indices.
-    lhs = ops.cat([ops.new_arange(prototype, b.start, b.stop) for b in lhs_blocks])
-    rhs = ops.cat([ops.new_arange(prototype, b.start, b.stop) for b in rhs_blocks])
+    lhs = ops.cat([ops.new_arange(prototype, *b) for b in lhs_blocks])
+    rhs = ops.cat([ops.new_arange(prototype, *b) for b in rhs_blocks])
     return lhs, rhs
 
 
+@lru_cache(maxsize=5000)
+def _split_plan(inputs, lhs_keys):
+    """
+    Computes maximal contiguous ``(start, stop)`` blocks for
+    :func:`_split_real_inputs`, cached by input schema.
+    """
+    lhs_blocks = []
+    rhs_blocks = []
+    start = 0
+    for key, domain in inputs:
+        if domain.dtype == "real":
+            stop = start + domain.num_elements
+            blocks = lhs_blocks if key in lhs_keys else rhs_blocks
+            if blocks and blocks[-1][1] == start:
+                blocks[-1] = (blocks[-1][0], stop)  # merge contiguous blocks
+            else:
+                blocks.append((start, stop))
+            start = stop
+    return tuple(lhs_blocks), tuple(rhs_blocks)
+
+
 def _find_intervals(intervals, end):
     """
     Finds a complete set of intervals partitioning [0, end), given a partial
@@ -300,6 +312,37 @@ class BlockMatrix(object):
         return result
 
 
+@lru_cache(maxsize=5000)
+def _alignment_plan(new_inputs, old_inputs):
+    """
+    Plan the alignment of a ``prec_sqrt`` matrix from ``old_inputs`` to
+    ``new_inputs``, each a tuple of ``(name, domain)`` pairs.
+
+    :return: a tuple ``(blocks, old_dim, pad_dim)``, where ``blocks`` are
+        ``(start, stop)`` row ranges of the old matrix padded with zero rows
+        up to ``pad_dim``, that concatenate to the rows of the new matrix.
+    :rtype: tuple
+    """
+    new_offsets, _ = _compute_offsets_cached(new_inputs)
+    old_offsets, old_dim = _compute_offsets_cached(old_inputs)
+    new_inputs = dict(new_inputs)
+    blocks = []
+    pad_dim = old_dim
+    for k in new_offsets:
+        num_elements = new_inputs[k].num_elements
+        if k in old_offsets:
+            start = old_offsets[k]
+        else:
+            start = pad_dim
+            pad_dim += num_elements
+        stop = start + num_elements
+        if blocks and blocks[-1][1] == start:
+            blocks[-1] = (blocks[-1][0], stop)  # merge contiguous blocks
+        else:
+            blocks.append((start, stop))
+    return tuple(blocks), old_dim, pad_dim
+
+
 def align_gaussian(new_inputs, old, expand=False):
     """
     Align data of a Gaussian distribution to a new ``inputs`` shape.
@@ -318,22 +361,21 @@ def align_gaussian(new_inputs, old, expand=False):
         prec_sqrt = align_tensor(new_ints, Tensor(prec_sqrt, old_ints), expand=expand)
 
     # Align real inputs, which are all concatenated in the rightmost dims.
-    new_offsets, new_dim = _compute_offsets(new_inputs)
-    old_offsets, old_dim = _compute_offsets(old.inputs)
+    # We gather all rows at once, pointing rows of new inputs into a block of
+    # zeros appended after the old rows.
+    blocks, old_dim, pad_dim = _alignment_plan(
+        tuple(new_inputs.items()), tuple(old.inputs.items())
+    )
     assert prec_sqrt.shape[-2:-1] == (old_dim,)
-    if new_offsets != old_offsets:
-        old_prec_sqrt = ops.transpose(prec_sqrt, -1, -2)
-        prec_sqrt = BlockVector(old_prec_sqrt.shape[:-1] + (new_dim,))
-        for k, new_offset in new_offsets.items():
-            if k not in old_offsets:
-                continue
-            offset = old_offsets[k]
-            num_elements = old.inputs[k].num_elements
-            old_slice = slice(offset, offset + num_elements)
-            new_slice = slice(new_offset, new_offset + num_elements)
-            prec_sqrt[..., new_slice] = old_prec_sqrt[..., old_slice]
-        prec_sqrt = prec_sqrt.as_tensor()
-        prec_sqrt = ops.transpose(prec_sqrt, -1, -2)
+    if pad_dim > old_dim:
+        pad_shape = prec_sqrt.shape[:-2] + (pad_dim - old_dim, prec_sqrt.shape[-1])
+        prec_sqrt = ops.cat([prec_sqrt, ops.new_zeros(prec_sqrt, pad_shape)], -2)
+    if blocks != ((0, pad_dim),):
+        if len(blocks) == 1:
+            prec_sqrt = prec_sqrt[..., blocks[0][0] : blocks[0][1], :]
+        else:
+            index = ops.cat([ops.new_arange(prec_sqrt, *block) for block in blocks])
+            prec_sqrt = prec_sqrt[..., index, :]
 
     return white_vec, prec_sqrt
 
@@ -568,19 +610,23 @@ class Gaussian(Funsor, metaclass=GaussianMeta):
     def _info_vec(self):
         return _mv(self.prec_sqrt, self.white_vec)
 
+    @lazy_property
+    def _white_vec_tril(self):
+        # This is the white_vec paired with prec_sqrt = self._precision_chol.
+        return ops.triangular_solve(self._info_vec[..., None], self._precision_chol)[
+            ..., 0
+        ]
+
     @lazy_property
     def _log_normalizer(self):
         dim = self.prec_sqrt.shape[-2]
         log_det_term = _log_det_tri(self._precision_chol)
-        result = 0.5 * dim * math.log(2 * math.pi) - log_det_term
+        result = 0.5 * dim * _LOG_2PI - log_det_term
         if self.rank == dim:
             return result
         # Shift, as in logic in _compress_rank().
         old_norm2 = _norm2(self.white_vec)
-        white_vec = ops.triangular_solve(
-            self._info_vec[..., None], self._precision_chol
-        )[..., 0]
-        new_norm2 = _norm2(white_vec)
+        new_norm2 = _norm2(self._white_vec_tril)
         shift = 0.5 * (new_norm2 - old_norm2)
         return result + shift
 
@@ -690,7 +736,7 @@ class Gaussian(Funsor, metaclass=GaussianMeta):
         batch_dim = len(tensors[0].shape) - 1
         batch_shape = broadcast_shape(*(x.shape[:batch_dim] for x in tensors))
         (white_vec, prec_sqrt), values = tensors[:2], tensors[2:]
-        offsets, event_size = _compute_offsets(self.inputs)
+        offsets, _ = _compute_offsets(self.inputs)
         slices = [
             (k, slice(offset, offset + self.inputs[k].num_elements))
             for k, offset in offsets.items()
@@ -707,12 +753,9 @@ class Gaussian(Funsor, metaclass=GaussianMeta):
         # Try to perform a complete substitution of all real variables,
         # resulting in a Tensor.
         if all(k in subs for k, d in self.inputs.items() if d.dtype == "real"):
-            # Form the concatenated value.
-            value = BlockVector(batch_shape + (event_size,))
-            for k, i in slices:
-                if k in values:
-                    value[..., i] = values[k]
-            value = value.as_tensor()
+            # Form the concatenated value. Since all real inputs are
+            # substituted, there are no gaps to fill.
+            value = ops.cat([values[k] for k, _ in slices], -1)
 
             # Evaluate the non-normalized log density.
             result = -0.5 * _norm2(_vm(value, prec_sqrt) - white_vec)
@@ -975,10 +1018,10 @@ class Gaussian(Funsor, metaclass=GaussianMeta):
             )
 
         if not remaining_real_inputs:  # Sample all variables.
-            # Triangularize via _compress_rank().
-            white_vec, prec_sqrt, _ = _compress_rank(
-                self.white_vec, self.prec_sqrt, assume_full_rank=True
-            )
+            # Triangularize as in _compress_rank(), but reusing the cached
+            # Cholesky factor that is also needed by self.log_normalizer.
+            white_vec = self._white_vec_tril
+            prec_sqrt = self._precision_chol
 
             # Jointly sample.
             # This section may involve either Funsors or backend arrays.
@@ -1044,7 +1087,7 @@ class Gaussian(Funsor, metaclass=GaussianMeta):
             )
 
         # Extract shaped components of the flat concatenated sample.
-        results = [remaining]
+        terms = []
         offsets, _ = _compute_offsets(sampled_real_inputs)
         for key, domain in sampled_real_inputs.items():
             point = sample[..., offsets[key] : offsets[key] + domain.num_elements]
@@ -1054,9 +1097,9 @@ class Gaussian(Funsor, metaclass=GaussianMeta):
                 inputs.update(int_inputs)
                 point = Tensor(point, inputs)
             assert point.output == domain
-            results.append(Delta(key, point))
+            terms.append((key, (point, Number(0.0))))
 
-        return reduce(ops.add, results)
+        return remaining + Delta(tuple(terms))
 
     def _marginalize_after_split(
         self, inputs, int_inputs, prec_sqrt_a, prec_sqrt_b, precision_chol_a
@@ -1068,13 +1111,15 @@ class Gaussian(Funsor, metaclass=GaussianMeta):
         dim_a = prec_sqrt_a.shape[-2]
         dim_b = prec_sqrt_b.shape[-2]
         result = Tensor(
-            dim_a * math.log(2 * math.pi) / 2 - _log_det_tri(precision_chol_a),
+            0.5 * dim_a * _LOG_2PI - _log_det_tri(precision_chol_a),
             int_inputs,
         )
         if self.rank > dim_a:
-            proj_a = _mtm(ops.triangular_solve(prec_sqrt_a, precision_chol_a))
-            prec_sqrt = prec_sqrt_b - prec_sqrt_b @ proj_a
-            white_vec = self.white_vec - _vm(self.white_vec, proj_a)
+            # Project via S = I - X' X where X = Qa \ Pa, applying X and X'
+            # in turn rather than materializing the rank-by-rank matrix X' X.
+            proj_a = ops.triangular_solve(prec_sqrt_a, precision_chol_a)
+            prec_sqrt = prec_sqrt_b - _mmt(prec_sqrt_b, proj_a) @ proj_a
+            white_vec = self.white_vec - _vm(_mv(proj_a, self.white_vec), proj_a)
             result += Gaussian(white_vec, prec_sqrt, inputs)
         else:  # The Gaussian over xa is zero.
             # TODO switch from an empty Gaussian to a Constant once this works:
@@ -244,11 +244,9 @@ def eager_integrate_gaussian_gaussian(log_measure, integrand, reduced_vars):
             norm = ops.exp(lhs._log_normalizer)
             # Then in rhs's whitened space, A = I so Tr(A cov) = Tr(cov).
             vmv_term = _norm2(rhs_white_vec - mean)
-            trace_term = (
-                (ops.triangular_solve(rhs_prec_sqrt, lhs._precision_chol) ** 2)
-                .sum(-1)
-                .sum(-1)
-            )
+            # This trace is the squared Frobenius norm of a triangular solve.
+            trace_sqrt = ops.triangular_solve(rhs_prec_sqrt, lhs._precision_chol)
+            trace_term = _norm2(trace_sqrt.reshape(trace_sqrt.shape[:-2] + (-1,)))
             data = (-0.5) * norm * (vmv_term + trace_term)
 
             inputs = OrderedDict(
@@ -1,6 +1,7 @@
 # Copyright Contributors to the Pyro project.
 # SPDX-License-Identifier: Apache-2.0
 
+import sys
 from abc import ABC, abstractmethod
 from collections.abc import Hashable
 from contextlib import ContextDecorator, contextmanager
@@ -9,7 +10,51 @@ from timeit import default_timer
 from . import instrument
 from .interpreter import get_interpretation, pop_interpretation, push_interpretation
 from .registry import KeyedRegistry
-from .util import get_backend
+from .util import lazy_property
+
+
+class _HashByIdTable(dict):
+    """
+    Table mapping a type to whether its instances should be keyed by ``id`` in
+    :meth:`Interpretation.make_hash_key`: unhashable types, and array types
+    that compare elementwise (:class:`torch.Tensor`) or whose hash raises
+    (:class:`jax.Array`).
+    """
+
+    def __missing__(self, typ):
+        result = not issubclass(typ, Hashable)
+        # Avoid "ImportError: sys.meta_path is None" on shutdown.
+        torch = sys.modules.get("torch")
+        if torch is not None and issubclass(typ, torch.Tensor):
+            result = True
+        jax_array = getattr(sys.modules.get("jax"), "Array", None)
+        if jax_array is not None and issubclass(typ, jax_array):
+            result = True
+        self[typ] = result
+        return result
+
+
+_HASH_BY_ID = _HashByIdTable()
+
+
+class _IdKey:
+    """
+    Hash key comparing an object by identity. Unlike a bare ``id``, this holds
+    a reference to the object, so the key cannot be matched by a different
+    object that later reuses the same ``id``.
+    """
+
+    __slots__ = ("obj", "_hash")
+
+    def __init__(self, obj):
+        self.obj = obj
+        self._hash = id(obj)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return type(other) is _IdKey and other.obj is self.obj
 
 
 class Interpretation(ContextDecorator, ABC):
@@ -52,18 +97,7 @@ class Interpretation(ContextDecorator, ABC):
 
     @staticmethod
     def make_hash_key(cls, *args):
-        backend = get_backend()
-        if backend == "torch":
-            # Avoid "ImportError: sys.meta_path is None" on shutdown.
-            from torch import Tensor
-
-            return tuple(
-                id(arg)
-                if isinstance(arg, Tensor) or not isinstance(arg, Hashable)
-                else arg
-                for arg in args
-            )
-        return tuple(id(arg) if not isinstance(arg, Hashable) else arg for arg in args)
+        return tuple(_IdKey(arg) if _HASH_BY_ID[type(arg)] else arg for arg in args)
 
 
 class CallableInterpretation(Interpretation):
@@ -156,15 +190,21 @@ class PrioritizedInterpretation(Interpretation):
     """
 
     def __init__(self, *subinterpretations):
+        # Flatten and deduplicate, since a repeated subinterpretation can only
+        # return None again.
         subinterpretations = tuple(
-            ss for s in subinterpretations for ss in s.subinterpretations
+            dict.fromkeys(ss for s in subinterpretations for ss in s.subinterpretations)
         )
         assert subinterpretations
         assert len(subinterpretations) < 10, "suspicious interpretation overflow"
         assert not any(s.is_total for s in subinterpretations[:-1])
-        super().__init__("/".join(s.__name__ for s in subinterpretations))
+        # Skip Interpretation.__init__, since __name__ is computed lazily.
         self._subinterpretations = subinterpretations
 
+    @lazy_property
+    def __name__(self):
+        return "/".join(s.__name__ for s in self._subinterpretations)
+
     @property
     def subinterpretations(self):
         return self._subinterpretations
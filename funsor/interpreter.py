@@ -110,13 +110,55 @@ _ground_types = (
 )
 
 
+class _GroundTypeTable(dict):
+    """
+    Table mapping a type to whether it is a subclass of ``_ground_types``.
+    """
+
+    def __missing__(self, typ):
+        result = self[typ] = issubclass(typ, _ground_types)
+        return result
+
+
+_GROUND_TYPE_TABLE = _GroundTypeTable()
+
+
 @singledispatch
-def children(x):
+def _children(x):
     if is_atom(x):
         return ()
     raise ValueError(type(x))
 
 
+class _ChildrenTable(dict):
+    """
+    Table mapping a type to its :func:`children` implementation, to avoid
+    :func:`~functools.singledispatch` overhead on every node.
+    """
+
+    def __missing__(self, typ):
+        result = self[typ] = _children.dispatch(typ)
+        return result
+
+
+_CHILDREN_TABLE = _ChildrenTable()
+
+
+def children(x):
+    return _CHILDREN_TABLE[type(x)](x)
+
+
+def _register_children(cls, func=None):
+    if func is None:
+        return lambda func: _register_children(cls, func)
+    _CHILDREN_TABLE.clear()
+    return _children.register(cls, func)
+
+
+children.register = _register_children
+children.dispatch = _children.dispatch
+
+
 # has to be registered in terms.py
 def children_funsor(x):
     return x._ast_values
@@ -135,14 +177,11 @@ def _children_tuple(x):
 
 
 def is_atom(x):
+    if _GROUND_TYPE_TABLE[type(x)]:
+        return True
     if isinstance(x, (tuple, frozenset)):
         return all(is_atom(c) for c in x)
-    return (
-        isinstance(x, _ground_types)
-        or is_numeric_array(x)
-        or is_nn_module(x)
-        or is_jax_compiled_function(x)
-    )
+    return is_numeric_array(x) or is_nn_module(x) or is_jax_compiled_function(x)
 
 
 def gensym(x=None):
@@ -156,34 +195,46 @@ def gensym(x=None):
     return "V" + str(sym)
 
 
-def anf(x, stop=is_atom):
-    stack = deque([x])
+def _toposort(x, stop=is_atom):
+    """
+    Returns the non-stop nodes of ``x`` in topological order, root last.
+    The graph is keyed by ``id`` to avoid hashing nodes, which is costly for
+    tuples and frozensets and goes through Python-level ``Funsor.__hash__``.
+    """
+    nodes = {id(x): x}
+    stack = [x]
     child_to_parents = defaultdict(list)
     children_counts = defaultdict(int)
     leaves = deque()
     while stack:
-        h = stack.popleft()
+        h = stack.pop()
+        h_id = id(h)
         for c in children(h):
             if stop(c):
                 continue
-            if c not in child_to_parents:
+            c_id = id(c)
+            if c_id not in nodes:
+                nodes[c_id] = c
                 stack.append(c)
-            child_to_parents[c].append(h)
-            children_counts[h] += 1
-        if children_counts[h] == 0:
-            leaves.append(h)
+            child_to_parents[c_id].append(h_id)
+            children_counts[h_id] += 1
+        if children_counts[h_id] == 0:
+            leaves.append(h_id)
 
-    env = OrderedDict(((x, x),))
+    # Every other node is a descendant of x, so x is always visited last.
+    result = []
     while leaves:
-        h = leaves.popleft()
-        for parent in child_to_parents[h]:
+        h_id = leaves.popleft()
+        for parent in child_to_parents[h_id]:
             children_counts[parent] -= 1
             if children_counts[parent] == 0:
                 leaves.append(parent)
-        env[h] = h
+        result.append(nodes[h_id])
+    return result
 
-    env.move_to_end(x)
-    return env
+
+def anf(x, stop=is_atom):
+    return {h: h for h in _toposort(x, stop)}
 
 
 def stack_reinterpret(x):
@@ -205,19 +256,18 @@ def stack_reinterpret(x):
         return x
 
     interpret = _STACK[-1].interpret
-    env = anf(x)
-    for key, value in env.items():
+    env = {}
+    for value in _toposort(x):
+        args = tuple(c if is_atom(c) else env[id(c)] for c in children(value))
         if isinstance(value, (tuple, frozenset)):  # TODO absorb this into interpret
-            env[key] = type(value)(c if is_atom(c) else env[c] for c in children(value))
+            env[id(value)] = type(value)(args)
         else:
-            env[key] = interpret(
-                type(value), *(c if is_atom(c) else env[c] for c in children(value))
-            )
-    return env[x]
+            env[id(value)] = interpret(type(value), *args)
+    return env[id(x)]
 
 
 @instrument.debug_logged
-def recursion_reinterpret(x):
+def recursion_reinterpret(x, memo=None):
     r"""
     Overloaded reinterpretation of a deferred expression.
     This interpreter uses the Python stack and is subject to the recursion limit.
@@ -228,15 +278,25 @@ def recursion_reinterpret(x):
     :param x: An input, typically involving deferred
         :class:`~funsor.terms.Funsor` s.
     :type x: A funsor or data structure holding funsors.
+    :param dict memo: An optional ``id``-keyed cache of results, used to
+        reinterpret shared subexpressions only once.
     :return: A reinterpreted version of the input.
     :raises: ValueError
     """
     if is_atom(x):
         return x
-    elif isinstance(x, (tuple, frozenset)):
-        return type(x)(map(recursion_reinterpret, children(x)))
+    if memo is None:
+        memo = {}
+    key = id(x)
+    if key in memo:
+        return memo[key]
+    args = tuple([recursion_reinterpret(c, memo) for c in children(x)])
+    if isinstance(x, (tuple, frozenset)):
+        result = type(x)(args)
     else:
-        return _STACK[-1].interpret(type(x), *map(recursion_reinterpret, children(x)))
+        result = _STACK[-1].interpret(type(x), *args)
+    memo[key] = result
+    return result
 
 
 def reinterpret(x):
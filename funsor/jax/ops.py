@@ -1,12 +1,14 @@
 # Copyright Contributors to the Pyro project.
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
 import numbers
 import typing
 
 import jax.numpy as np
 import jax.random
 import numpy as onp
+import opt_einsum
 from jax import lax
 from jax.core import Tracer
 from jax.scipy.linalg import cho_solve, solve_triangular
@@ -107,15 +109,27 @@ def _argmin(x, axis, keepdims):
     return np.argmin(x, axis)
 
 
+@functools.partial(jax.jit, static_argnums=(1,))
+def _jit_astype(x, dtype):
+    return x.astype(dtype)
+
+
 @ops.astype.register(array)
 def _astype(x, dtype):
-    return x.astype(np.result_type(dtype))
+    dtype = np.result_type(dtype)
+    if np.result_type(x) == dtype:
+        return x
+    if isinstance(x, (onp.generic, onp.ndarray)):
+        # Keep numpy inputs on the host rather than converting to jax arrays.
+        return x.astype(dtype)
+    return _jit_astype(x, dtype)
 
 
 ops.cat.register(typing.Tuple[typing.Union[array], ...])(np.concatenate)
 
 
 @ops.cholesky.register(array)
+@jax.jit
 def _cholesky(x):
     """
     Like :func:`numpy.linalg.cholesky` but uses sqrt for scalar matrices.
@@ -126,6 +140,7 @@ def _cholesky(x):
 
 
 @ops.cholesky_inverse.register(array)
+@jax.jit
 def _cholesky_inverse(x):
     """
     Like :func:`torch.cholesky_inverse` but supports batching and gradients.
@@ -135,6 +150,8 @@ def _cholesky_inverse(x):
 
 @ops.cholesky_solve.register(array, array)
 def _cholesky_solve(x, y):
+    if y.shape[-1] == 1:
+        return x / (y * y)
     return cho_solve((y, True), x)
 
 
@@ -148,9 +165,21 @@ def _diagonal(x, dim1, dim2):
     return np.diagonal(x, axis1=dim1, axis2=dim2)
 
 
+@functools.lru_cache(maxsize=256)
+def _einsum_expression(equation, shapes):
+    return opt_einsum.contract_expression(equation, *shapes)
+
+
 @ops.einsum.register(typing.Tuple[typing.Union[array], ...])
 def _einsum(operands, equation):
-    return np.einsum(equation, *operands)
+    if len(operands) <= 2:
+        return np.einsum(equation, *operands)
+    # Contract pairwise along an optimized path, reusing it across calls.
+    expr = _einsum_expression(equation, tuple(np.shape(x) for x in operands))
+    return expr(*operands, backend="jax.numpy")
+
+
+_jit_broadcast_to = jax.jit(np.broadcast_to, static_argnums=(1,))
 
 
 @ops.expand.register(array)
@@ -160,7 +189,9 @@ def _expand(x, shape):
     shape = shape[:prepend_dim] + tuple(
         dx if size == -1 else size for dx, size in zip(np.shape(x), shape[prepend_dim:])
     )
-    return np.broadcast_to(x, shape)
+    if shape == np.shape(x):
+        return x
+    return _jit_broadcast_to(x, shape)
 
 
 @ops.finfo.register(array)
@@ -168,6 +199,14 @@ def _finfo(x):
     return np.finfo(np.result_type(x))
 
 
+@functools.lru_cache(maxsize=32)
+def _dtype_max(dtype):
+    try:
+        return np.finfo(dtype).max
+    except ValueError:
+        return np.iinfo(dtype).max
+
+
 for typ in array:
 
     @ops.is_numeric_array.register(typ)
@@ -191,22 +230,11 @@ def _log(x):
 
 
 @ops.logaddexp.register(array, array)
-def _safe_logaddexp_tensor_tensor(x, y):
-    finfo = np.finfo(np.result_type(x))
-    shift = np.clip(ops.max(ops.detach(x), ops.detach(y)), a_max=None, a_min=finfo.min)
-    return np.log(np.exp(x - shift) + np.exp(y - shift)) + shift
-
-
 @ops.logaddexp.register(numbers.Number, array)
-def _safe_logaddexp_number_tensor(x, y):
-    finfo = np.finfo(np.result_type(y))
-    shift = np.clip(ops.detach(y), a_max=None, a_min=max(x, finfo.min))
-    return np.log(np.exp(x - shift) + np.exp(y - shift)) + shift
-
-
 @ops.logaddexp.register(array, numbers.Number)
-def _safe_logaddexp_tensor_number(x, y):
-    return _safe_logaddexp_number_tensor(y, x)
+def _logaddexp(x, y):
+    # jax.numpy.logaddexp is stable for infinite inputs and fuses into one kernel.
+    return np.logaddexp(x, y)
 
 
 ops.max.register(array, array)(np.maximum)
@@ -248,10 +276,16 @@ def _new_arange(x, start, stop, step):
     return np.arange(start)
 
 
+@functools.lru_cache(maxsize=64)
+def _host_eye(n, dtype):
+    return onp.eye(n, dtype=dtype)
+
+
 @ops.new_eye.register(array)
 def _new_eye(x, shape):
     n = shape[-1]
-    return np.broadcast_to(np.eye(n), shape + (n,))
+    # Like np.eye(n), use the default float dtype regardless of x.
+    return np.broadcast_to(_host_eye(n, np.result_type(float)), shape + (n,))
 
 
 @ops.new_zeros.register(array)
@@ -266,29 +300,25 @@ def _randn(prototype, shape, rng_key=None):
 
 
 @ops.reciprocal.register(array)
+@jax.jit
 def _reciprocal(x):
-    result = np.clip(np.reciprocal(x), a_max=np.finfo(np.result_type(x)).max)
+    result = np.clip(np.reciprocal(x), a_max=_dtype_max(np.result_type(x)))
     return result
 
 
 @ops.safediv.register(array, array)
 @ops.safediv.register((int, float), array)
+@jax.jit
 def _safediv(x, y):
-    try:
-        finfo = np.finfo(np.result_type(y))
-    except ValueError:
-        finfo = np.iinfo(np.result_type(y))
-    return x * np.clip(np.reciprocal(y), a_min=None, a_max=finfo.max)
+    return x * np.clip(
+        np.reciprocal(y), a_min=None, a_max=_dtype_max(np.result_type(y))
+    )
 
 
 @ops.safesub.register(array, array)
 @ops.safesub.register((int, float), array)
 def _safesub(x, y):
-    try:
-        finfo = np.finfo(np.result_type(y))
-    except ValueError:
-        finfo = np.iinfo(np.result_type(y))
-    return x + np.clip(-y, a_min=None, a_max=finfo.max)
+    return x + np.clip(-y, a_min=None, a_max=_dtype_max(np.result_type(y)))
 
 
 @ops.scatter.register(array, tuple, array)
@@ -302,8 +332,11 @@ def _stack(parts, dim=0):
 
 
 @ops.triangular_solve.register(array, array)
+@functools.partial(jax.jit, static_argnames=("upper", "transpose"))
 def _triangular_solve(x, y, upper=False, transpose=False):
     assert np.ndim(x) >= 2 and np.ndim(y) >= 2
+    if y.shape[-1] == 1:
+        return x / y
     n, m = x.shape[-2:]
     assert y.shape[-2:] == (n, n)
     # NB: JAX requires x and y have the same batch_shape
@@ -312,47 +345,18 @@ def _triangular_solve(x, y, upper=False, transpose=False):
     if y.shape[:-2] == batch_shape:
         return solve_triangular(y, x, trans=int(transpose), lower=not upper)
 
-    # The following procedure handles the case: y.shape = (i, 1, n, n), x.shape = (..., i, j, n, m)
-    # because we don't want to broadcast y to the shape (i, j, n, n).
-    # We are going to make x have shape (..., 1, j,  i, 1, n) to apply batched triangular_solve
-    dx = x.ndim
-    prepend_ndim = dx - y.ndim  # ndim of ... part
-    # Reshape x with the shape (..., 1, i, j, 1, n, m)
-    x_new_shape = batch_shape[:prepend_ndim]
-    for sy, sx in zip(y.shape[:-2], batch_shape[prepend_ndim:]):
-        x_new_shape += (sx // sy, sy)
-    x_new_shape += (n, m)
-    x = np.reshape(x, x_new_shape)
-    # Permute y to make it have shape (..., 1, j, m, i, 1, n)
-    batch_ndim = x.ndim - 2
-    permute_dims = (
-        tuple(range(prepend_ndim))
-        + tuple(range(prepend_ndim, batch_ndim, 2))
-        + (batch_ndim + 1,)
-        + tuple(range(prepend_ndim + 1, batch_ndim, 2))
-        + (batch_ndim,)
+    # Map over batch dims, broadcasting y along dims where it has size 1.
+    # This lets JAX fold those dims into the columns of x rather than
+    # materializing a broadcasted y.
+    y_shape = (1,) * (len(batch_shape) + 2 - y.ndim) + y.shape
+    y_mapped = tuple(size != 1 for size in y_shape[:-2])
+    y = np.reshape(
+        y, tuple(size for size, mapped in zip(y_shape, y_mapped) if mapped) + (n, n)
     )
-    x = np.transpose(x, permute_dims)
-    x_permute_shape = x.shape
-
-    # reshape to (-1, i, 1, n)
-    x = np.reshape(x, (-1,) + y.shape[:-1])
-    # permute to (i, 1, n, -1)
-    x = np.moveaxis(x, 0, -1)
-
-    sol = solve_triangular(
-        y, x, trans=int(transpose), lower=not upper
-    )  # shape: (i, 1, n, -1)
-    sol = np.moveaxis(sol, -1, 0)  # shape: (-1, i, 1, n)
-    sol = np.reshape(sol, x_permute_shape)  # shape: (..., 1, j, m, i, 1, n)
-
-    # now we permute back to x_new_shape = (..., 1, i, j, 1, n, m)
-    permute_inv_dims = tuple(range(prepend_ndim))
-    for i in range(y.ndim - 2):
-        permute_inv_dims += (prepend_ndim + i, dx + i - 1)
-    permute_inv_dims += (sol.ndim - 1, prepend_ndim + y.ndim - 2)
-    sol = np.transpose(sol, permute_inv_dims)
-    return sol.reshape(batch_shape + (n, m))
+    solve = functools.partial(solve_triangular, trans=int(transpose), lower=not upper)
+    for mapped in reversed(y_mapped):
+        solve = jax.vmap(solve, in_axes=(0 if mapped else None, 0))
+    return solve(y, x)
 
 
 @ops.triangular_inv.register(array)
@@ -4,9 +4,10 @@
 import math
 import numbers
 import typing
-from functools import singledispatch
+from functools import lru_cache, singledispatch
 
 import numpy as np
+import opt_einsum
 
 from .builtin import (
     AssociativeOp,
@@ -89,8 +90,14 @@ def prod(x, axis=None, keepdims=False):
 def logsumexp(x, axis=None, keepdims=False):
     amax = np.amax(x, axis=axis, keepdims=True)
     # treat the case x = -inf
-    amax = np.where(np.isfinite(amax), amax, 0.0)
-    unnormalized_lse = log(np.sum(np.exp(x - amax), axis, keepdims=keepdims))
+    amax = np.nan_to_num(amax, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+    # exponentiate in place to avoid a second input-sized temporary
+    shifted = x - amax
+    if isinstance(shifted, np.ndarray) and shifted.dtype.kind == "f":
+        np.exp(shifted, out=shifted)
+    else:
+        shifted = np.exp(shifted)
+    unnormalized_lse = log(np.sum(shifted, axis, keepdims=keepdims))
     amax = amax if keepdims else amax.squeeze(axis)
     return unnormalized_lse + amax
 
@@ -195,13 +202,33 @@ def clamp(x, min=None, max=None):
 clamp.register(array)(np.clip)
 
 
+def _cholesky_2x2(x):
+    # Closed form, vectorized over the batch, avoiding LAPACK per-matrix calls.
+    a00 = x[..., 0, 0]
+    if not np.all(a00 > 0):
+        return np.linalg.cholesky(x)  # raises LinAlgError as usual
+    l00 = np.sqrt(a00)
+    l10 = x[..., 1, 0] / l00
+    l11_sq = x[..., 1, 1] - l10 * l10
+    if not np.all(l11_sq > 0):
+        return np.linalg.cholesky(x)
+    result = np.zeros_like(x)
+    result[..., 0, 0] = l00
+    result[..., 1, 0] = l10
+    result[..., 1, 1] = np.sqrt(l11_sq)
+    return result
+
+
 @UnaryOp.make
 def cholesky(x):
     """
-    Like :func:`numpy.linalg.cholesky` but uses sqrt for scalar matrices.
+    Like :func:`numpy.linalg.cholesky` but uses sqrt for scalar matrices and
+    a closed form for large batches of 2x2 matrices.
     """
     if x.shape[-1] == 1:
         return np.sqrt(x)
+    if x.shape[-1] == 2 and x.size >= 1024:
+        return _cholesky_2x2(x)
     return np.linalg.cholesky(x)
 
 
@@ -213,11 +240,20 @@ def cholesky_inverse(x):
     return cholesky_solve(new_eye(x, x.shape[:-1]), x)
 
 
+def _solve(a, b):
+    # Avoid np.linalg.solve treating b as a batch of vectors when it has
+    # fewer batch dims than a.
+    if b.ndim < a.ndim:
+        b = b.reshape((1,) * (a.ndim - b.ndim) + b.shape)
+    return np.linalg.solve(a, b)
+
+
 @BinaryOp.make
 def cholesky_solve(x, y):
-    y_inv = np.linalg.inv(y)
-    A = np.swapaxes(y_inv, -2, -1) @ y_inv
-    return A @ x
+    if y.shape[-1] == 1:
+        return x / (y * y)
+    # Solve against the factor in turn rather than explicitly inverting it.
+    return _solve(np.swapaxes(y, -2, -1), _solve(y, x))
 
 
 @UnaryOp.make
@@ -257,18 +293,33 @@ def einsum(operands, equation):
     raise NotImplementedError
 
 
+@lru_cache(maxsize=256)
+def _einsum_expression(equation, shapes):
+    return opt_einsum.contract_expression(equation, *shapes)
+
+
 @einsum.register(arraylist)
 def _einsum(operands, equation):
-    return np.einsum(equation, *operands)
+    if len(operands) <= 2:
+        return np.einsum(equation, *operands)
+    # Contract pairwise along an optimized path, reusing it across calls.
+    expr = _einsum_expression(equation, tuple(np.shape(x) for x in operands))
+    result = expr(*operands, backend="numpy")
+    # Like np.einsum, return a numpy scalar rather than a 0-d array.
+    return result[()] if result.ndim == 0 else result
 
 
 @UnaryOp.make
 def expand(x, shape):
     prepend_dim = len(shape) - np.ndim(x)
     assert prepend_dim >= 0
-    shape = shape[:prepend_dim] + tuple(
-        dx if size == -1 else size for dx, size in zip(np.shape(x), shape[prepend_dim:])
-    )
+    if -1 in shape[prepend_dim:]:
+        shape = shape[:prepend_dim] + tuple(
+            dx if size == -1 else size
+            for dx, size in zip(np.shape(x), shape[prepend_dim:])
+        )
+    if shape == np.shape(x):
+        return x
     return np.broadcast_to(x, shape)
 
 
@@ -277,6 +328,15 @@ def finfo(x):
     return np.finfo(x.dtype)
 
 
+@lru_cache(maxsize=32)
+def _dtype_limits(dtype):
+    try:
+        info = np.finfo(dtype)
+    except ValueError:
+        info = np.iinfo(dtype)
+    return info.min, info.max
+
+
 # this isn't really a mathematical op
 @singledispatch
 def is_numeric_array(x):
@@ -295,15 +355,28 @@ for typ in array:
 
 @logaddexp.register(array, array)
 def _safe_logaddexp_tensor_tensor(x, y):
-    finfo = np.finfo(x.dtype)
-    shift = np.clip(max(detach(x), detach(y)), a_max=None, a_min=finfo.min)
-    return np.log(np.exp(x - shift) + np.exp(y - shift)) + shift
+    fmin, _ = _dtype_limits(x.dtype)
+    # numpy arrays carry no gradients, so skip dispatching ops.max and detach.
+    shift = np.maximum(x, y)
+    if not np.ndim(shift):
+        shift = np.clip(shift, a_max=None, a_min=fmin)
+        return np.log(np.exp(x - shift) + np.exp(y - shift)) + shift
+    # Reuse buffers to avoid allocating a temporary for each elementwise op.
+    np.maximum(shift, fmin, out=shift)
+    result = x - shift
+    np.exp(result, out=result)
+    temp = y - shift
+    np.exp(temp, out=temp)
+    result += temp
+    np.log(result, out=result)
+    result += shift
+    return result
 
 
 @logaddexp.register(numbers.Number, array)
 def _safe_logaddexp_number_tensor(x, y):
-    finfo = np.finfo(y.dtype)
-    shift = np.clip(detach(y), a_max=None, a_min=max(x, finfo.min))
+    fmin, _ = _dtype_limits(y.dtype)
+    shift = np.clip(y, a_max=None, a_min=max(x, fmin))
     return np.log(np.exp(x - shift) + np.exp(y - shift)) + shift
 
 
@@ -377,30 +450,28 @@ def permute(x, dims):
     return np.transpose(x, axes=dims)
 
 
+def _clip_max(x, a_max):
+    # Clip in place when x is a fresh array, to avoid a second full buffer.
+    return np.minimum(x, a_max, out=x if isinstance(x, np.ndarray) else None)
+
+
 @reciprocal.register(array)
 def _reciprocal(x):
-    result = np.clip(np.reciprocal(x), a_max=np.finfo(x.dtype).max)
-    return result
+    return _clip_max(np.reciprocal(x), _dtype_limits(x.dtype)[1])
 
 
 @safediv.register(array, array)
 @safediv.register(numbers.Number, array)
 def _safediv(x, y):
-    try:
-        finfo = np.finfo(y.dtype)
-    except ValueError:
-        finfo = np.iinfo(y.dtype)
-    return x * np.clip(np.reciprocal(y), a_min=None, a_max=finfo.max)
+    _, fmax = _dtype_limits(y.dtype)
+    return x * _clip_max(np.reciprocal(y), fmax)
 
 
 @safesub.register(array, array)
 @safesub.register(numbers.Number, array)
 def _safesub(x, y):
-    try:
-        finfo = np.finfo(y.dtype)
-    except ValueError:
-        finfo = np.iinfo(y.dtype)
-    return x + np.clip(-y, a_min=None, a_max=finfo.max)
+    _, fmax = _dtype_limits(y.dtype)
+    return x + _clip_max(np.negative(y), fmax)
 
 
 @TernaryOp.make
@@ -450,13 +521,18 @@ def flip(array, axis):
 
 @BinaryOp.make
 def triangular_solve(x, y, upper=False, transpose=False):
+    if y.shape[-1] == 1:
+        return x / y
     if transpose:
         y = np.swapaxes(y, -2, -1)
-    return np.linalg.inv(y) @ x
+    # Solve directly rather than explicitly inverting the triangular factor.
+    return _solve(y, x)
 
 
 @UnaryOp.make
 def triangular_inv(x, upper=False):
+    if x.shape[-1] == 1:
+        return np.reciprocal(x)
     return np.linalg.inv(x)
 
 
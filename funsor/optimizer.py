@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import collections
+import functools
+import itertools
 
 from opt_einsum.paths import greedy
 
@@ -91,12 +93,20 @@ def eager_contract_base(red_op, bin_op, reduced_vars, *terms):
     return None
 
 
+@functools.lru_cache(maxsize=4096)
+def _greedy_path(input_names, output_names, size_items):
+    return greedy(list(input_names), output_names, dict(size_items))
+
+
 @optimize.register(Contraction, AssociativeOp, AssociativeOp, frozenset, tuple)
 def optimize_contract_finitary_funsor(red_op, bin_op, reduced_vars, terms):
     if red_op is ops.null or bin_op is ops.null:
         return None
     if (red_op, bin_op) not in DISTRIBUTIVE_OPS:
         return None
+    # like eager_contract_base, there is no path to optimize for fewer terms
+    if len(terms) <= 2:
+        return None
 
     # build opt_einsum optimizer IR
     inputs = [term.input_vars for term in terms]
@@ -109,36 +119,40 @@ def optimize_contract_finitary_funsor(red_op, bin_op, reduced_vars, terms):
 
     # optimize path with greedy opt_einsum optimizer
     # TODO switch to new 'auto' strategy
-    input_names = [frozenset(term.inputs) for term in terms]
+    # and memoize the path, since the same contraction shapes recur often.
+    input_names = tuple(frozenset(term.inputs) for term in terms)
     output_names = frozenset(v.name for v in outputs)
-    path = greedy(input_names, output_names, size_dict)
+    path = _greedy_path(input_names, output_names, frozenset(size_dict.items()))
 
     # first prepare a reduce_dim counter to avoid early reduction
-    reduce_dim_counter = collections.Counter()
-    for input in inputs:
-        reduce_dim_counter.update({d: 1 for d in input})
+    reduce_dim_counter = collections.Counter(itertools.chain.from_iterable(inputs))
 
     operands = list(terms)
+    # track each operand's input_vars alongside it, to avoid recomputing them
+    input_sets = list(inputs)
     for a, b in path:
         b, a = tuple(sorted((a, b), reverse=True))
         tb = operands.pop(b)
         ta = operands.pop(a)
+        sb = input_sets.pop(b)
+        sa = input_sets.pop(a)
 
         # don't reduce a dimension too early - keep a collections.Counter
         # and only reduce when the dimension is removed from all lhs terms in path
-        reduce_dim_counter.subtract({d: 1 for d in reduced_vars & ta.input_vars})
-        reduce_dim_counter.subtract({d: 1 for d in reduced_vars & tb.input_vars})
+        for d in reduced_vars & sa:
+            reduce_dim_counter[d] -= 1
+        for d in reduced_vars & sb:
+            reduce_dim_counter[d] -= 1
 
         # reduce variables that don't appear in other terms
-        both_vars = ta.input_vars | tb.input_vars
+        both_vars = sa | sb
         path_end_reduced_vars = frozenset(
             d for d in reduced_vars & both_vars if reduce_dim_counter[d] == 0
         )
 
         # count new appearance of variables that aren't reduced
-        reduce_dim_counter.update(
-            {d: 1 for d in reduced_vars & (both_vars - path_end_reduced_vars)}
-        )
+        for d in reduced_vars & (both_vars - path_end_reduced_vars):
+            reduce_dim_counter[d] += 1
 
         path_end = Contraction(
             red_op if path_end_reduced_vars else ops.null,
@@ -148,6 +162,7 @@ def optimize_contract_finitary_funsor(red_op, bin_op, reduced_vars, terms):
             tb,
         )
         operands.append(path_end)
+        input_sets.append(both_vars - path_end_reduced_vars)
 
     # reduce any remaining dims, if necessary
     final_reduced_vars = (
@@ -15,6 +15,7 @@ Methods return only the narrower subclass
 :class:`pyro.distributions.TorchDistribution` objects.
 """
 
+import functools
 import math
 from collections import OrderedDict
 
@@ -45,6 +46,7 @@ def default_dim_to_name(inputs_shape, event_inputs):
     )
 
 
+@functools.lru_cache(maxsize=64)
 def default_name_to_dim(event_inputs):
     if not event_inputs:
         return NAME_TO_DIM
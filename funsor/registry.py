@@ -45,15 +45,17 @@ class PartialDispatcher(Dispatcher):
         """
         Likde :meth:`__call__` but avoids calling ``func()``.
         """
-        types = tuple(map(typing_wrap, map(deep_type, args)))
+        # Key the cache on raw deep types, deferring typing_wrap to cache misses.
+        types = tuple(map(deep_type, args))
         try:
             func = self._cache[types]
         except KeyError:
-            func = self.dispatch(*types)
+            wrapped_types = tuple(map(typing_wrap, types))
+            func = self.dispatch(*wrapped_types)
             if func is None:
                 raise NotImplementedError(
                     "Could not find signature for %s: <%s>"
-                    % (self.name, ", ".join(cls.__name__ for cls in types))
+                    % (self.name, ", ".join(cls.__name__ for cls in wrapped_types))
                 )
             self._cache[types] = func
         return func
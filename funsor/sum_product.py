@@ -29,36 +29,34 @@ from funsor.util import quote
 
 
 def _partition(terms, sum_vars):
-    # Construct a bipartite graph between terms and the vars
-    neighbors = OrderedDict([(t, []) for t in terms])
-    for term in terms:
-        for dim in term.inputs.keys():
+    # Union terms that share a sum var, indexing terms by position to avoid
+    # hashing funsors.
+    parent = list(range(len(terms)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = i = parent[parent[i]]
+        return i
+
+    dim_to_term = {}
+    for i, term in enumerate(terms):
+        for dim in term.inputs:
             if dim in sum_vars:
-                neighbors[term].append(dim)
-                neighbors.setdefault(dim, []).append(term)
-
-    # Partition the bipartite graph into connected components for contraction.
-    components = []
-    while neighbors:
-        v, pending = neighbors.popitem()
-        component = OrderedDict([(v, None)])  # used as an OrderedSet
-        for v in pending:
-            component[v] = None
-        while pending:
-            v = pending.pop()
-            for v in neighbors.pop(v):
-                if v not in component:
-                    component[v] = None
-                    pending.append(v)
-
-        # Split this connected component into tensors and dims.
-        component_terms = tuple(v for v in component if isinstance(v, Funsor))
-        if component_terms:
-            component_dims = frozenset(
-                v for v in component if not isinstance(v, Funsor)
-            )
-            components.append((component_terms, component_dims))
-    return components
+                j = dim_to_term.setdefault(dim, i)
+                if j != i:
+                    parent[find(i)] = find(j)
+
+    # Collect connected components for contraction, in order of first term.
+    root_to_terms = OrderedDict()
+    for i, term in enumerate(terms):
+        root_to_terms.setdefault(find(i), []).append(term)
+    root_to_dims = defaultdict(set)
+    for dim, i in dim_to_term.items():
+        root_to_dims[find(i)].add(dim)
+    return [
+        (tuple(component_terms), frozenset(root_to_dims[root]))
+        for root, component_terms in root_to_terms.items()
+    ]
 
 
 def _unroll_plate(factors, var_to_ordinal, sum_vars, plate, step):
@@ -613,11 +613,13 @@ def tensor_to_data(x, name_to_dim=None):
         )
         # permute packed dimensions to correct order
         unsorted_dims = [name_to_dim[name] for name in x.inputs]
-        dims = sorted(unsorted_dims)
-        permutation = [unsorted_dims.index(dim) for dim in dims] + list(
-            range(len(dims), len(dims) + len(x.output.shape))
-        )
-        data = ops.permute(data, permutation)
+        input_perm = sorted(range(len(unsorted_dims)), key=unsorted_dims.__getitem__)
+        dims = [unsorted_dims[i] for i in input_perm]
+        if input_perm != list(range(len(dims))):
+            permutation = input_perm + list(
+                range(len(dims), len(dims) + len(x.output.shape))
+            )
+            data = ops.permute(data, permutation)
         # expand
         batch_shape = [1] * -min(dims)
         for dim, size in zip(dims, data.shape):
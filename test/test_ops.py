@@ -8,7 +8,7 @@ import pytest
 from funsor import ops
 from funsor.distribution import BACKEND_TO_DISTRIBUTIONS_BACKEND
 from funsor.ops.builtin import parse_ellipsis, parse_slice
-from funsor.testing import desugar_getitem
+from funsor.testing import assert_close, desugar_getitem, randn
 from funsor.util import get_backend
 
 
@@ -74,3 +74,31 @@ def test_parse_ellipsis(index, left, right):
 def test_parse_slice(s, size, start, stop, step):
     actual = parse_slice(s, size)
     assert actual == (start, stop, step)
+
+
+@pytest.mark.parametrize("x_batch_shape", [(), (4,), (2, 1)])
+@pytest.mark.parametrize("y_batch_shape", [(), (4,)])
+@pytest.mark.parametrize("transpose", [False, True])
+def test_triangular_solve_broadcast(x_batch_shape, y_batch_shape, transpose):
+    x = randn(x_batch_shape + (3, 2))
+    m = randn(y_batch_shape + (3, 3))
+    y = ops.cholesky(ops.new_eye(m, (3,)) + m @ ops.transpose(m, -1, -2))
+    actual = ops.triangular_solve(x, y, transpose=transpose)
+    expected = x + ops.new_zeros(actual, actual.shape)
+    y_t = ops.transpose(y, -1, -2)
+    assert_close((y_t if transpose else y) @ actual, expected, atol=1e-4)
+
+    actual = ops.cholesky_solve(x, y)
+    assert_close(y @ y_t @ actual, expected, atol=1e-4)
+
+
+@pytest.mark.parametrize("batch_shape", [(), (5,), (300,), (20, 30)])
+@pytest.mark.parametrize("size", [1, 2, 3])
+def test_cholesky(batch_shape, size):
+    m = randn(batch_shape + (size, size))
+    x = ops.new_eye(m, (size,)) + m @ ops.transpose(m, -1, -2)
+    actual = ops.cholesky(x)
+    assert_close(actual @ ops.transpose(actual, -1, -2), x, atol=1e-4)
+    for i in range(size):
+        for j in range(i + 1, size):
+            assert_close(actual[..., i, j], ops.new_zeros(actual, batch_shape))